@@ -1,6 +1,9 @@
 from django.contrib import admin
-from .models import Student, Subject, Grade
+from .models import Student, Subject, Grade, Term, ArchivedGrade, ArchivedEnrollment
 
 admin.site.register(Student)
 admin.site.register(Subject)
-admin.site.register(Grade)
\ No newline at end of file
+admin.site.register(Grade)
+admin.site.register(Term)
+admin.site.register(ArchivedGrade)
+admin.site.register(ArchivedEnrollment)
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Student
+
+# --- Student Autocomplete ---
+# In-memory prefix index over student names, emails and IDs for type-ahead.
+# Each process keeps its own index, built by the web worker warm-up (or else
+# by the first search). Model signals update it in place, and a background
+# thread periodically compares (count, last update) with the table to rebuild
+# it when another process or a bulk_create (which sends no signals) changed
+# it, so searches never query the database.
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ['student_id', 'first_name', 'last_name', 'course', 'year_level', 'section']
+
+
+def _tokens(student_id, first_name, last_name, email):
+    tokens = {student_id.lower(), email.lower(), email.split('@')[0].lower()}
+    tokens.update(first_name.lower().split())
+    tokens.update(last_name.lower().split())
+    tokens.discard('')
+    return tokens
+
+
+class StudentPrefixIndex:
+    def __init__(self):
+        self._lock = threading.RLock()         # guards the index data
+        self._build_lock = threading.Lock()    # one build at a time
+        self._keys = []        # sorted (token, student_id) pairs
+        self._tokens = {}      # student_id -> tokens, for updates and removals
+        self._entries = {}     # student_id -> dropdown fields
+        self._signature = None
+        self._built = False
+        self._refresher = None
+
+    def _table_signature(self):
+        stats = Student.objects.aggregate(count=Count('pk'), updated=Max('updated_at'))
+        return stats['count'], stats['updated']
+
+    def build(self):
+        with self._build_lock:
+            self._build()
+
+    def _build(self):
+        signature = self._table_signature()
+        keys, tokens, entries = [], {}, {}
+        rows = Student.objects.order_by().values_list(*RESULT_FIELDS, 'email')
+        for row in rows.iterator(chunk_size=5000):
+            entry = dict(zip(RESULT_FIELDS, row))
+            student_tokens = _tokens(entry['student_id'], entry['first_name'], entry['last_name'], row[-1])
+            entries[entry['student_id']] = entry
+            tokens[entry['student_id']] = student_tokens
+            keys.extend((token, entry['student_id']) for token in student_tokens)
+        keys.sort()
+        with self._lock:
+            self._keys, self._tokens, self._entries = keys, tokens, entries
+            self._signature = signature
+            self._built = True
+
+    def ensure_built(self):
+        # Concurrent first searches wait for a single build
+        if not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self._build()
+        self.start_refresher()
+
+    def refresh(self):
+        # Rebuilds when another process or a bulk_create changed the table
+        if self._table_signature() != self._signature:
+            self.build()
+
+    def start_refresher(self):
+        interval = getattr(settings, 'AUTOCOMPLETE_REFRESH_SECONDS', 60)
+        if not interval or self._refresher is not None:
+            return
+        with self._build_lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop, args=(interval,), name='student-autocomplete-refresh', daemon=True,
+                )
+                self._refresher.start()
+
+    def _refresh_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Refreshing the student autocomplete index failed")
+            finally:
+                # This thread's connections aren't covered by request cleanup
+                connections.close_all()
+
+    def upsert(self, student, created=False):
+        if not self._built:
+            return  # Not built yet; the first search loads everything
+        with self._lock:
+            self._remove(student.student_id)
+            entry = {field: getattr(student, field) for field in RESULT_FIELDS}
+            student_tokens = _tokens(student.student_id, student.first_name, student.last_name, student.email)
+            self._entries[student.student_id] = entry
+            self._tokens[student.student_id] = student_tokens
+            for token in student_tokens:
+                insort(self._keys, (token, student.student_id))
+            # Account for our own write so it doesn't trigger a rebuild
+            if self._signature is not None:
+                count, updated = self._signature
+                updated = max(updated, student.updated_at) if updated else student.updated_at
+                self._signature = (count + int(created), updated)
+
+    def remove(self, student_id):
+        if not self._built:
+            return
+        with self._lock:
+            if student_id in self._entries and self._signature is not None:
+                count, updated = self._signature
+                self._signature = (count - 1, updated)
+            self._remove(student_id)
+
+    def _remove(self, student_id):
+        for token in self._tokens.pop(student_id, ()):
+            i = bisect_left(self._keys, (token, student_id))
+            if i < len(self._keys) and self._keys[i] == (token, student_id):
+                del self._keys[i]
+        self._entries.pop(student_id, None)
+
+    def search(self, query, limit=10):
+        """
+        Returns up to ``limit`` students matching every word of ``query`` as a
+        prefix of one of their tokens (first/last name, email or student ID).
+        """
+        terms = query.lower().split()
+        if not terms:
+            return []
+        self.ensure_built()
+        with self._lock:
+            # Scan the term with the fewest index entries; check the others per student
+            ranges = sorted(
+                (bisect_left(self._keys, (term + '\uffff',)) - bisect_left(self._keys, (term,)), term)
+                for term in set(terms)
+            )
+            scan = ranges[0][1]
+            others = [term for _, term in ranges[1:]]
+            results, seen = [], set()
+            i = bisect_left(self._keys, (scan,))
+            while i < len(self._keys) and len(results) < limit:
+                token, student_id = self._keys[i]
+                if not token.startswith(scan):
+                    break
+                i += 1
+                if student_id in seen:
+                    continue
+                seen.add(student_id)
+                student_tokens = self._tokens[student_id]
+                if all(any(t.startswith(term) for t in student_tokens) for term in others):
+                    results.append(self._entries[student_id])
+        return results
+
+
+student_index = StudentPrefixIndex()
+
+
+@receiver(post_save, sender=Student)
+def update_student_index(sender, instance, created=False, **kwargs):
+    student_index.upsert(instance, created)
+
+
+@receiver(post_delete, sender=Student)
+def remove_from_student_index(sender, instance, **kwargs):
+    student_index.remove(instance.student_id)
@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import ArchivedEnrollment, ArchivedGrade, Enrollment, Grade, Term
+
+
+class Command(BaseCommand):
+    help = "Move a closed term's grades and enrollments into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('term', help="Code of the term to archive (e.g., 2025-1)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            # Locked so the term can't be made current (or archived by another
+            # run) between these checks and the move
+            try:
+                term = Term.objects.select_for_update().get(code=options['term'])
+            except Term.DoesNotExist:
+                raise CommandError(f"Term '{options['term']}' does not exist.")
+            if term.is_current:
+                raise CommandError("The current term cannot be archived.")
+            if term.is_archived:
+                raise CommandError(f"Term '{term.code}' is already archived.")
+
+            grades = Grade.objects.filter(term=term).select_related('subject').order_by()
+            archived_grades = (
+                ArchivedGrade(
+                    term=term,
+                    student_id=grade.student_id,
+                    subject_code=grade.subject_id,
+                    units=grade.subject.units,
+                    activity_grade=grade.activity_grade,
+                    quiz_grade=grade.quiz_grade,
+                    exam_grade=grade.exam_grade,
+                    final_grade=Decimal(str(round(grade.final_grade, 2))),
+                )
+                for grade in grades.iterator(chunk_size=batch_size)
+            )
+            grade_count = self._bulk_insert(ArchivedGrade, archived_grades, batch_size)
+
+            enrollments = Enrollment.objects.filter(term=term).order_by()
+            archived_enrollments = (
+                ArchivedEnrollment(
+                    term=term,
+                    student_id=enrollment.student_id,
+                    subject_code=enrollment.subject_id,
+                    enrollment_date=enrollment.enrollment_date,
+                )
+                for enrollment in enrollments.iterator(chunk_size=batch_size)
+            )
+            enrollment_count = self._bulk_insert(ArchivedEnrollment, archived_enrollments, batch_size)
+
+            grades.delete()
+            enrollments.delete()
+            term.is_archived = True
+            term.save(update_fields=['is_archived'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived term {term.code}: {grade_count} grades, {enrollment_count} enrollments."
+        ))
+
+    def _bulk_insert(self, model, objects, batch_size):
+        count = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            count += len(batch)
+        return count
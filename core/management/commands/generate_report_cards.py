@@ -0,0 +1,51 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Student, Term
+from core.report_cards import default_workers, generate_report_cards
+
+
+class Command(BaseCommand):
+    help = "Generate HTML report cards for a cohort of students, one file per student."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help="Directory the report cards are written to")
+        parser.add_argument('--term', help="Term code, or 'all' for every term (default: current term)")
+        parser.add_argument('--course')
+        parser.add_argument('--year-level')
+        parser.add_argument('--section', type=int)
+        parser.add_argument('--workers', type=int, default=default_workers(), help="Rendering processes")
+
+    def handle(self, *args, **options):
+        if options['term'] == 'all':
+            term = None
+        elif options['term']:
+            term = Term.objects.filter(code=options['term']).first()
+            if term is None:
+                raise CommandError(f"Term '{options['term']}' does not exist.")
+        else:
+            term = Term.current()
+
+        students = Student.objects.all()
+        if options['course']:
+            students = students.filter(course=options['course'])
+        if options['year_level']:
+            students = students.filter(year_level=options['year_level'])
+        if options['section'] is not None:
+            students = students.filter(section=options['section'])
+
+        os.makedirs(options['output_dir'], exist_ok=True)
+        started = time.perf_counter()
+        count = 0
+        for student_id, card in generate_report_cards(students, term, options['workers']):
+            with open(os.path.join(options['output_dir'], f"{student_id}.html"), 'w', encoding='utf-8') as f:
+                f.write(card)
+            count += 1
+        elapsed = time.perf_counter() - started
+
+        rate = count / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {count} report cards in {elapsed:.2f}s ({rate:.1f} cards/sec)."
+        ))
@@ -0,0 +1,37 @@
+from zipfile import BadZipFile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.roster import DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, import_roster
+
+
+class Command(BaseCommand):
+    help = "Bulk import students from a CSV roster, with an optional ZIP of photos named by student ID."
+
+    def add_arguments(self, parser):
+        parser.add_argument('roster', help="Path to the roster CSV file")
+        parser.add_argument('--photos', help="Path to a ZIP archive of student photos")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Parallel photo workers")
+
+    def handle(self, *args, **options):
+        try:
+            events = import_roster(
+                options['roster'],
+                photo_archive=options['photos'],
+                chunk_size=options['chunk_size'],
+                workers=options['workers'],
+            )
+            for event in events:
+                if event['event'] == 'start':
+                    self.stdout.write(f"Importing {event['total']} rows ({event['photos']} photos)...")
+                elif event['event'] == 'progress':
+                    for error in event['errors']:
+                        self.stderr.write(f"  line {error.get('line', '?')} [{error.get('student_id', '')}]: {error['errors']}")
+                    self.stdout.write(f"  {event['processed']}/{event['total']} processed, {event['created']} created")
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Done: {event['created']} created, {event['skipped']} skipped."
+                    ))
+        except (OSError, ValueError, BadZipFile) as e:
+            raise CommandError(str(e))
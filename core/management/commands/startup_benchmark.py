@@ -0,0 +1,22 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from schoolapi.warmup import benchmark
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time to first response in fresh processes, with and without warm-up."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/subjects/', help="Request path used for the first response")
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for warm in (False, True):
+            results = benchmark(options['path'], options['runs'], warm)
+            label = "with warm-up (as in gunicorn post_fork)" if warm else "cold"
+            self.stdout.write(f"{label}: status {results[0]['status']}, median of {len(results)} runs")
+            for phase in results[0]['timings']:
+                median = statistics.median(r['timings'][phase] for r in results)
+                self.stdout.write(f"  {phase:<24} {median * 1000:8.1f} ms")
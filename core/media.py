@@ -0,0 +1,122 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .storage import CONTENT_ADDRESSED_PATTERN
+
+# --- Media Serving ---
+# Serves files under MEDIA_ROOT with cache headers, ETag/Last-Modified
+# revalidation and single byte-range requests, or hands the transfer to the
+# front server via X-Sendfile / X-Accel-Redirect (MEDIA_SENDFILE).
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def _parse_range(header, size):
+    """
+    Returns (start, end) for a single satisfiable byte range, None when the
+    header should be ignored (absent or multiple ranges), or 'invalid' when
+    it cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.replace(' ', ''))
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return 'invalid'
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            return 'invalid'
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return 'invalid'
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid path.")
+    if not os.path.isfile(fullpath):
+        raise Http404("File not found.")
+    stat = os.stat(fullpath)
+
+    match = re.search(CONTENT_ADDRESSED_PATTERN, path)
+    if match:
+        etag = f'"{match.group("digest")}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        cache_control = f'public, max-age={getattr(settings, "MEDIA_CACHE_MAX_AGE", 3600)}'
+
+    def with_headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = cache_control
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    # 304 Not Modified / 412 Precondition Failed
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:
+        return with_headers(conditional)
+
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+
+    sendfile = getattr(settings, 'MEDIA_SENDFILE', None)
+    if sendfile:
+        # The front server streams the file (and handles Range itself)
+        response = HttpResponse(content_type=content_type)
+        if sendfile == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        else:
+            response['X-Sendfile'] = fullpath
+        return with_headers(response)
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    # If-Range: only honour the range when the client's copy is still current
+    if range_header and request.META.get('HTTP_IF_RANGE', etag) == etag:
+        byte_range = _parse_range(range_header, stat.st_size)
+
+    if byte_range == 'invalid':
+        response = HttpResponse(status=416, content_type=content_type)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return with_headers(response)
+    if byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_read_range(fullpath, start, length), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Content-Length'] = str(length)
+        return with_headers(response)
+
+    response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+    return with_headers(response)
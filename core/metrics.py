@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+
+# --- Rejection Metrics ---
+# Counters for requests turned away by throttles or the concurrency limiter.
+# They live in the default cache so every worker process reports into the
+# same numbers when a shared cache backend is configured.
+
+METRICS_TIMEOUT = None  # Counters never expire
+
+
+def _key(reason, scope):
+    return f"metrics:rejected:{reason}:{scope}"
+
+
+def record_rejection(reason, scope):
+    key = _key(reason, scope)
+    cache.add(key, 0, timeout=METRICS_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, timeout=METRICS_TIMEOUT)
+
+
+def rejection_counts():
+    # Scopes are known from settings, so the counters can be read in one call
+    scopes = {
+        'throttled': settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {}).keys(),
+        'overloaded': getattr(settings, 'CONCURRENCY_LIMITS', {}).keys(),
+    }
+    keys = {_key(reason, scope): (reason, scope) for reason, names in scopes.items() for scope in names}
+    values = cache.get_many(keys)
+    counts = {reason: {} for reason in scopes}
+    for key, (reason, scope) in keys.items():
+        counts[reason][scope] = values.get(key, 0)
+    return counts
@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, F, Q, Value, When
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from .metrics import record_rejection
+from .models import InFlightCounter
+
+# --- Concurrency Limiter ---
+# Sheds load on expensive routes: when a route (by URL name) already has
+# CONCURRENCY_LIMITS[name] requests in flight, new ones get a 503 with
+# Retry-After instead of queueing behind busy workers. In-flight counts are
+# kept in InFlightCounter rows, taken and given back with single UPDATE
+# statements, so the budget spans worker processes and concurrent requests
+# can't both claim the last slot.
+#
+# A slot is held until the response is closed, so streamed bodies (e.g. the
+# roster import) count for as long as they run.
+
+# A counter nobody has taken a slot from (or refreshed) for this long is
+# presumed to hold slots leaked by a worker that died mid-request, and starts
+# over. This must exceed gunicorn's worker timeout (30s by default); streamed
+# responses refresh it every IN_FLIGHT_TIMEOUT / 4 seconds.
+IN_FLIGHT_TIMEOUT = 120
+
+
+def _acquire(name, limit):
+    # Returns whether a slot was taken. Rejected requests don't write, so
+    # they never keep a leaked counter alive.
+    now = timezone.now()
+    stale = Q(updated_at__lt=now - timedelta(seconds=IN_FLIGHT_TIMEOUT))
+    slots = InFlightCounter.objects.filter(Q(count__lt=limit) | stale, name=name)
+    take = {'count': Case(When(stale, then=Value(1)), default=F('count') + 1), 'updated_at': now}
+    if slots.update(**take):
+        return True
+    _, created = InFlightCounter.objects.get_or_create(name=name, defaults={'updated_at': now})
+    return created and bool(slots.update(**take))
+
+
+def _release(name):
+    InFlightCounter.objects.filter(name=name, count__gt=0).update(count=F('count') - 1)
+
+
+def _refresh(name):
+    InFlightCounter.objects.filter(name=name).update(updated_at=timezone.now())
+
+
+class _HeldStream:
+    # Wraps streaming content so the slot is released when Django closes the
+    # response (after the body is sent, or when the client goes away)
+    def __init__(self, content, name):
+        self._content = content
+        self._name = name
+        self._released = False
+
+    def __iter__(self):
+        refreshed = time.monotonic()
+        for chunk in self._content:
+            if time.monotonic() - refreshed >= IN_FLIGHT_TIMEOUT / 4:
+                _refresh(self._name)
+                refreshed = time.monotonic()
+            yield chunk
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            _release(self._name)
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limits = getattr(settings, 'CONCURRENCY_LIMITS', {})
+        self.retry_after = getattr(settings, 'CONCURRENCY_RETRY_AFTER', 2)
+
+    def __call__(self, request):
+        try:
+            name = resolve(request.path_info).url_name
+        except Resolver404:
+            name = None
+        limit = self.limits.get(name)
+        if limit is None:
+            return self.get_response(request)
+
+        if not _acquire(name, limit):
+            record_rejection('overloaded', name)
+            response = JsonResponse({'message': 'Server is busy, please retry shortly.'}, status=503)
+            response['Retry-After'] = str(self.retry_after)
+            return response
+
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            _release(name)
+            raise
+        if response.streaming and not getattr(response, 'is_async', False):
+            response.streaming_content = _HeldStream(response.streaming_content, name)
+        else:
+            _release(name)
+        return response
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_legacy_term(apps, schema_editor):
+    # Existing grades and enrollments predate terms; group them under one term
+    Term = apps.get_model('core', 'Term')
+    Grade = apps.get_model('core', 'Grade')
+    Enrollment = apps.get_model('core', 'Enrollment')
+    if not (Grade.objects.exists() or Enrollment.objects.exists()):
+        return
+    term, _ = Term.objects.get_or_create(
+        code='legacy',
+        defaults={'name': 'Legacy (before terms)', 'is_current': not Term.objects.filter(is_current=True).exists()},
+    )
+    Grade.objects.filter(term__isnull=True).update(term=term)
+    Enrollment.objects.filter(term__isnull=True).update(term=term)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_enrollment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('code', models.CharField(help_text='Term code (e.g., 2025-1)', max_length=20, primary_key=True, serialize=False, unique=True)),
+                ('name', models.CharField(help_text='Display name (e.g., 1st Semester 2025-2026)', max_length=100)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('is_current', models.BooleanField(default=False, help_text='Term used by default when listing and creating records')),
+                ('is_archived', models.BooleanField(default=False, help_text='Set once grades and enrollments have been moved to the archive tables')),
+            ],
+            options={
+                'ordering': ['-start_date', 'code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedGrade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_id', models.CharField(db_index=True, max_length=20)),
+                ('subject_code', models.CharField(max_length=20)),
+                ('units', models.DecimalField(decimal_places=1, max_digits=3)),
+                ('activity_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('quiz_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('exam_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('final_grade', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_grades', to='core.term')),
+            ],
+            options={
+                'ordering': ['student_id', 'term', 'subject_code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_id', models.CharField(db_index=True, max_length=20)),
+                ('subject_code', models.CharField(max_length=20)),
+                ('enrollment_date', models.DateTimeField()),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_enrollments', to='core.term')),
+            ],
+            options={
+                'ordering': ['student_id', 'term', 'subject_code'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='enrollment',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='grade',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='enrollments', to='core.term'),
+        ),
+        migrations.AddField(
+            model_name='grade',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='grades', to='core.term'),
+        ),
+        migrations.RunPython(assign_legacy_term, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='enrollment',
+            unique_together={('student', 'subject', 'term')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='grade',
+            unique_together={('student', 'subject', 'term')},
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['term', 'student'], name='core_enroll_term_id_c5bd73_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['term', 'student'], name='core_grade_term_id_a97ccc_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedgrade',
+            unique_together={('term', 'student_id', 'subject_code')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedenrollment',
+            unique_together={('term', 'student_id', 'subject_code')},
+        ),
+    ]
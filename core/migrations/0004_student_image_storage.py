@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:01
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_term'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Profile picture of the student', null=True, storage=core.storage.student_image_storage, upload_to='student_images/'),
+        ),
+    ]
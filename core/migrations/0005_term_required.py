@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_legacy_term(apps, schema_editor):
+    # Rows written while no term was current have no term; group them under
+    # the same 'legacy' term 0003 uses so the column can become NOT NULL
+    Term = apps.get_model('core', 'Term')
+    Grade = apps.get_model('core', 'Grade')
+    Enrollment = apps.get_model('core', 'Enrollment')
+    if not (Grade.objects.filter(term__isnull=True).exists() or Enrollment.objects.filter(term__isnull=True).exists()):
+        return
+    term, _ = Term.objects.get_or_create(
+        code='legacy',
+        defaults={'name': 'Legacy (before terms)', 'is_current': not Term.objects.filter(is_current=True).exists()},
+    )
+    Grade.objects.filter(term__isnull=True).update(term=term)
+    Enrollment.objects.filter(term__isnull=True).update(term=term)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_student_image_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_legacy_term, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='term',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='enrollments', to='core.term'),
+        ),
+        migrations.AlterField(
+            model_name='grade',
+            name='term',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='grades', to='core.term'),
+        ),
+    ]
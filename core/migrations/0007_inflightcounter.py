@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_cache_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InFlightCounter',
+            fields=[
+                ('name', models.CharField(help_text='URL name of the route', max_length=100, primary_key=True, serialize=False)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(help_text='Last time a slot was taken or a streamed response refreshed it')),
+            ],
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 import datetime
 
+from .storage import student_image_storage
+
 COURSE_CHOICES = [
     ('BSIT', 'BSIT - Bachelor of Science in Information Technology'),
     ('BSCS', 'BSCS - Bachelor of Science in Computer Science'),
@@ -24,6 +26,34 @@ GENDER_CHOICES = [
     ('Other', 'Other'),
 ]
 
+# --- Term Model ---
+# An academic term (e.g. "2025-1"). Grades and enrollments belong to a term so
+# queries can be scoped to the current one and closed terms can be archived.
+class Term(models.Model):
+    code = models.CharField(max_length=20, unique=True, primary_key=True, help_text="Term code (e.g., 2025-1)")
+    name = models.CharField(max_length=100, help_text="Display name (e.g., 1st Semester 2025-2026)")
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    is_current = models.BooleanField(default=False, help_text="Term used by default when listing and creating records")
+    is_archived = models.BooleanField(default=False, help_text="Set once grades and enrollments have been moved to the archive tables")
+
+    class Meta:
+        ordering = ['-start_date', 'code']
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        # Only one term can be current at a time
+        if self.is_current:
+            Term.objects.exclude(pk=self.pk).filter(is_current=True).update(is_current=False)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(is_current=True).first()
+
+
 # --- Student Model ---
 # Represents a student with their personal and academic details.
 class Student(models.Model):
@@ -37,7 +67,7 @@ class Student(models.Model):
     section = models.IntegerField(help_text="Student's section (e.g., 1, 2, 3)") # Section as an Integer
     course = models.CharField(max_length=100, choices=COURSE_CHOICES)
     year_level = models.CharField(max_length=20, choices=YEAR_LEVEL_CHOICES)
-    image = models.ImageField(upload_to='student_images/', null=True, blank=True, help_text="Profile picture of the student") # Image upload field
+    image = models.ImageField(upload_to='student_images/', storage=student_image_storage, null=True, blank=True, help_text="Profile picture of the student") # Image upload field
     contact_number = models.CharField(max_length=20, blank=True, null=True) # Added Contact Number
     address = models.TextField(blank=True, null=True) # Added Address
 
@@ -86,12 +116,14 @@ class Grade(models.Model):
     activity_grade = models.DecimalField(max_digits=5, decimal_places=2, help_text="Grade for activities (0-100)")
     quiz_grade = models.DecimalField(max_digits=5, decimal_places=2, help_text="Grade for quizzes (0-100)")
     exam_grade = models.DecimalField(max_digits=5, decimal_places=2, help_text="Grade for exams (0-100)")
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='grades')
 
     class Meta:
-        # Ensures that a student can only have one grade entry per subject
-        unique_together = ('student', 'subject')
+        # Ensures that a student can only have one grade entry per subject per term
+        unique_together = ('student', 'subject', 'term')
         # Default ordering for queries
         ordering = ['student', 'subject']
+        indexes = [models.Index(fields=['term', 'student'])]
 
     def __str__(self):
         # String representation for admin and debugging
@@ -109,11 +141,62 @@ class Enrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='enrollments')
     enrollment_date = models.DateTimeField(auto_now_add=True) # Automatically set when created
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='enrollments')
 
     class Meta:
-        unique_together = ('student', 'subject') # Ensures a student can only enroll in a subject once
+        unique_together = ('student', 'subject', 'term') # Ensures a student can only enroll in a subject once per term
         verbose_name = "Enrollment"
         verbose_name_plural = "Enrollments"
+        indexes = [models.Index(fields=['term', 'student'])]
+
+    def __str__(self):
+        return f"{self.student.first_name} {self.student.last_name} enrolled in {self.subject.name}"
+
+
+# --- Archive Models ---
+# Closed terms are moved here by the archive_term command. Rows keep plain
+# student/subject keys (no foreign keys) and a precomputed final grade so the
+# hot Grade/Enrollment tables stay small while transcripts remain available.
+class ArchivedGrade(models.Model):
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='archived_grades')
+    student_id = models.CharField(max_length=20, db_index=True)
+    subject_code = models.CharField(max_length=20)
+    units = models.DecimalField(max_digits=3, decimal_places=1)
+    activity_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    quiz_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    exam_grade = models.DecimalField(max_digits=5, decimal_places=2)
+    final_grade = models.DecimalField(max_digits=5, decimal_places=2)
+
+    class Meta:
+        unique_together = ('term', 'student_id', 'subject_code')
+        ordering = ['student_id', 'term', 'subject_code']
+
+    def __str__(self):
+        return f"Archived grade for {self.student_id} in {self.subject_code} ({self.term_id})"
+
+
+class ArchivedEnrollment(models.Model):
+    term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name='archived_enrollments')
+    student_id = models.CharField(max_length=20, db_index=True)
+    subject_code = models.CharField(max_length=20)
+    enrollment_date = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('term', 'student_id', 'subject_code')
+        ordering = ['student_id', 'term', 'subject_code']
+
+    def __str__(self):
+        return f"{self.student_id} enrolled in {self.subject_code} ({self.term_id})"
+
+
+# --- In-Flight Counter Model ---
+# Requests currently running on a load-shed route (see
+# core.middleware.ConcurrencyLimitMiddleware), shared by every worker process.
+# Only changed with single UPDATE statements, so increments are atomic.
+class InFlightCounter(models.Model):
+    name = models.CharField(max_length=100, primary_key=True, help_text="URL name of the route")
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(help_text="Last time a slot was taken or a streamed response refreshed it")
 
     def __str__(self):
-        return f"{self.student.first_name} {self.student.last_name} enrolled in {self.subject.name}"   
\ No newline at end of file
+        return f"{self.name}: {self.count} in flight"
@@ -0,0 +1,184 @@
+import csv
+import io
+import os
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from PIL import Image
+
+from .models import Student
+
+# --- Roster Import ---
+# Bulk creates Student rows from a CSV roster, optionally attaching photos
+# from a ZIP archive whose file names are the student IDs (e.g. 202212312.jpg).
+
+ROSTER_FIELDS = [
+    'student_id', 'first_name', 'last_name', 'gender', 'date_of_birth',
+    'email', 'section', 'course', 'year_level', 'contact_number', 'address',
+]
+REQUIRED_FIELDS = [
+    'student_id', 'first_name', 'last_name', 'date_of_birth',
+    'email', 'section', 'course', 'year_level',
+]
+PHOTO_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_WORKERS = 4
+
+# Keeps "IN (...)" lookups under SQLite's bound parameter limit
+LOOKUP_BATCH_SIZE = 900
+
+
+def _read_rows(csv_file):
+    # Accepts paths and uploaded (binary) files as well as text streams
+    if isinstance(csv_file, (str, os.PathLike)):
+        with open(csv_file, 'rb') as f:
+            yield from _read_rows(f)
+        return
+    if not isinstance(csv_file, io.TextIOBase):
+        csv_file = io.TextIOWrapper(csv_file, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(csv_file)
+    missing = [f for f in REQUIRED_FIELDS if f not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Roster is missing required columns: {', '.join(missing)}")
+    # Line 1 is the header row
+    for line, row in enumerate(reader, start=2):
+        yield line, {
+            field: (row.get(field) or '').strip()
+            for field in ROSTER_FIELDS
+        }
+
+
+def _index_photos(archive):
+    # Maps student_id -> member name for every image in the archive
+    photos = {}
+    for name in archive.namelist():
+        if name.endswith('/'):
+            continue
+        stem, ext = os.path.splitext(os.path.basename(name))
+        if ext.lower() in PHOTO_EXTENSIONS:
+            photos[stem] = name
+    return photos
+
+
+def _existing_values(field, values):
+    # Set-based uniqueness check: one query per LOOKUP_BATCH_SIZE values
+    values = list(values)
+    found = set()
+    for i in range(0, len(values), LOOKUP_BATCH_SIZE):
+        batch = values[i:i + LOOKUP_BATCH_SIZE]
+        found.update(
+            Student.objects.filter(**{f'{field}__in': batch}).values_list(field, flat=True)
+        )
+    return found
+
+
+def _build_student(row):
+    data = {field: value for field, value in row.items() if value != ''}
+    if 'gender' not in data:
+        data['gender'] = 'Other'
+    student = Student(**data)
+    # Field-level validation covers choices (course, year level, gender),
+    # email format and date/int parsing without hitting the database.
+    student.full_clean(exclude=['image'], validate_unique=False)
+    return student
+
+
+def _attach_photo(archive, student, member):
+    try:
+        data = archive.read(member)
+    except (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError):
+        # Corrupt (bad CRC), truncated, encrypted or unsupported member
+        return student.student_id, "Photo could not be read from the archive."
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+    except Exception:
+        return student.student_id, "Photo is not a valid image."
+    ext = os.path.splitext(member)[1].lower()
+    student.image.save(f"{student.student_id}{ext}", ContentFile(data), save=False)
+    return student.student_id, None
+
+
+def import_roster(csv_file, photo_archive=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS):
+    """
+    Imports a CSV roster, yielding progress events as dicts.
+
+    Rows are validated in chunks; each chunk's valid rows are inserted with a
+    single bulk_create. Invalid or duplicate rows are reported and skipped.
+    """
+    archive = zipfile.ZipFile(photo_archive) if photo_archive is not None else None
+    try:
+        photos = _index_photos(archive) if archive else {}
+        rows = list(_read_rows(csv_file))
+    except BaseException:
+        if archive:
+            archive.close()
+        raise
+    yield {'event': 'start', 'total': len(rows), 'photos': len(photos)}
+
+    taken_ids = _existing_values('student_id', (r['student_id'] for _, r in rows))
+    taken_emails = _existing_values('email', (r['email'] for _, r in rows))
+
+    created = skipped = 0
+    pool = ThreadPoolExecutor(max_workers=workers) if archive else None
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            errors = []
+            students = []
+            for line, row in chunk:
+                if row['student_id'] in taken_ids:
+                    errors.append({'line': line, 'student_id': row['student_id'], 'errors': {'student_id': ["Student with this ID already exists."]}})
+                    continue
+                if row['email'] in taken_emails:
+                    errors.append({'line': line, 'student_id': row['student_id'], 'errors': {'email': ["Student with this email already exists."]}})
+                    continue
+                try:
+                    student = _build_student(row)
+                except ValidationError as e:
+                    errors.append({'line': line, 'student_id': row['student_id'], 'errors': e.message_dict})
+                    continue
+                taken_ids.add(student.student_id)
+                taken_emails.add(student.email)
+                students.append(student)
+
+            if pool:
+                jobs = [
+                    pool.submit(_attach_photo, archive, s, photos[s.student_id])
+                    for s in students if s.student_id in photos
+                ]
+                for job in jobs:
+                    student_id, error = job.result()
+                    if error:
+                        errors.append({'student_id': student_id, 'errors': {'image': [error]}})
+
+            try:
+                with transaction.atomic():
+                    Student.objects.bulk_create(students, batch_size=chunk_size)
+            except IntegrityError as e:
+                # Rows inserted concurrently by another request; the whole chunk is rolled back
+                errors.append({'line': chunk[0][0], 'errors': {'non_field_errors': [f"Chunk rejected: {e}"]}})
+                students = []
+
+            created += len(students)
+            skipped += len(chunk) - len(students)
+            yield {
+                'event': 'progress',
+                'processed': start + len(chunk),
+                'total': len(rows),
+                'created': created,
+                'skipped': skipped,
+                'errors': errors,
+            }
+    finally:
+        if pool:
+            pool.shutdown()
+        if archive:
+            archive.close()
+
+    yield {'event': 'done', 'total': len(rows), 'created': created, 'skipped': skipped}
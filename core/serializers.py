@@ -1,7 +1,29 @@
 from rest_framework import serializers
-from .models import Student, Subject, Grade, Enrollment
+from .models import Student, Subject, Grade, Enrollment, Term
 from django.contrib.auth.models import User
 
+# --- Term Serializer ---
+class TermSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Term
+        fields = ['code', 'name', 'start_date', 'end_date', 'is_current', 'is_archived']
+        # Archiving is done by the archive_term management command
+        read_only_fields = ['is_archived']
+
+    def validate_is_current(self, value):
+        # New grades and enrollments go into the current term
+        if value and self.instance is not None and self.instance.is_archived:
+            raise serializers.ValidationError("An archived term cannot be made current.")
+        return value
+
+# Used as the default term for new grades and enrollments
+class CurrentTermDefault:
+    def __call__(self):
+        term = Term.current()
+        if term is None:
+            raise serializers.ValidationError("No current term is set; pass a term explicitly.")
+        return term
+
 class StudentSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField(read_only=True)
 
@@ -37,19 +59,20 @@ class GradeSerializer(serializers.ModelSerializer):
     student_details = StudentSerializer(source='student', read_only=True)
     subject_details = SubjectSerializer(source='subject', read_only=True)
     final_grade = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    term = serializers.PrimaryKeyRelatedField(queryset=Term.objects.filter(is_archived=False), default=CurrentTermDefault())
 
     class Meta:
         model = Grade
         fields = [
-            'id', 'student', 'subject', 'activity_grade', 'quiz_grade', 'exam_grade',
+            'id', 'student', 'subject', 'term', 'activity_grade', 'quiz_grade', 'exam_grade',
             'final_grade', 'student_details', 'subject_details'
         ]
         read_only_fields = ['id', 'final_grade', 'student_details', 'subject_details']
         validators = [
             serializers.UniqueTogetherValidator(
                 queryset=Grade.objects.all(),
-                fields=['student', 'subject'],
-                message="A grade for this student and subject already exists."
+                fields=['student', 'subject', 'term'],
+                message="A grade for this student and subject already exists for this term."
             )
         ]   
 
@@ -81,11 +104,12 @@ class EnrollmentSerializer(serializers.ModelSerializer):
     # These fields will embed the full student and subject details directly into the enrollment response
     student_details = StudentSerializer(source='student', read_only=True)
     subject_details = SubjectSerializer(source='subject', read_only=True)
+    term = serializers.PrimaryKeyRelatedField(queryset=Term.objects.filter(is_archived=False), default=CurrentTermDefault())
 
     class Meta:
         model = Enrollment
         fields = [
-            'id', 'student', 'subject', 'enrollment_date',
+            'id', 'student', 'subject', 'term', 'enrollment_date',
             'student_details', 'subject_details'
         ]
         read_only_fields = ['id', 'enrollment_date', 'student_details', 'subject_details']
@@ -98,4 +122,36 @@ class EnrollmentSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"student": "This field is required."})
             if 'subject' not in data:
                 raise serializers.ValidationError({"subject": "This field is required."})
-        return data
\ No newline at end of file
+        return data
+
+# --- Transcript Serializer ---
+# Shared shape for live grades and archived grades in a student's transcript
+class TranscriptEntrySerializer(serializers.Serializer):
+    term = serializers.CharField()
+    subject_code = serializers.CharField()
+    units = serializers.DecimalField(max_digits=3, decimal_places=1)
+    activity_grade = serializers.DecimalField(max_digits=5, decimal_places=2)
+    quiz_grade = serializers.DecimalField(max_digits=5, decimal_places=2)
+    exam_grade = serializers.DecimalField(max_digits=5, decimal_places=2)
+    final_grade = serializers.DecimalField(max_digits=5, decimal_places=2)
+    archived = serializers.BooleanField()
+
+# --- Dashboard Serializers ---
+# Compact grade/student shapes for the dashboard endpoints (no nested student
+# details repeated on every grade).
+class DashboardGradeSerializer(serializers.ModelSerializer):
+    subject_name = serializers.CharField(source='subject.name', read_only=True)
+    units = serializers.DecimalField(source='subject.units', max_digits=3, decimal_places=1, read_only=True)
+    final_grade = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Grade
+        fields = [
+            'id', 'subject', 'subject_name', 'units', 'term',
+            'activity_grade', 'quiz_grade', 'exam_grade', 'final_grade'
+        ]
+
+class DashboardStudentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Student
+        fields = ['student_id', 'first_name', 'last_name', 'email']
@@ -0,0 +1,53 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.files.utils import validate_file_name
+
+# --- Content-Addressed Storage ---
+# Stores each upload under the SHA-256 of its contents, e.g.
+# "student_images/3f/3fa4...e1.jpg". Identical files share one copy, and a
+# name never changes content, so it can be cached forever by clients.
+
+CONTENT_ADDRESSED_PATTERN = r'(?:^|/)[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})\.[A-Za-z0-9]+$'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, *args, **kwargs):
+        # Two identical uploads can both get past the exists() check in save();
+        # the second then rewrites the same bytes instead of failing
+        super().__init__(*args, allow_overwrite=True, **kwargs)
+
+    def get_available_name(self, name, max_length=None):
+        # Same name means same bytes, so never add a suffix that would break
+        # CONTENT_ADDRESSED_PATTERN (and with it deduplication and caching)
+        if re.search(CONTENT_ADDRESSED_PATTERN, name):
+            return name
+        return super().get_available_name(name, max_length=max_length)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+
+        extension = os.path.splitext(name)[1].lower()
+        name = posixpath.join(posixpath.dirname(name), digest[:2], digest + extension)
+        validate_file_name(name, allow_relative_path=True)
+        if self.exists(name):
+            return name  # Same bytes already stored
+        return super().save(name, content, max_length=max_length)
+
+
+# Storage for Student.image, configured as STORAGES['student_images']
+def student_image_storage():
+    return storages['student_images']
@@ -1,3 +1,868 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+from schoolapi import warmup
+
+from .autocomplete import StudentPrefixIndex, student_index
+from .media import _parse_range
+from .metrics import rejection_counts
+from .report_cards import iter_report_cards
+from .roster import import_roster
+from .middleware import IN_FLIGHT_TIMEOUT, _acquire, _release
+from .models import ArchivedEnrollment, ArchivedGrade, Enrollment, Grade, InFlightCounter, Student, Subject, Term
+from .storage import ContentAddressedStorage
+from .throttling import LoginIPThrottle
+
+
+def make_student(student_id, **kwargs):
+    fields = {
+        'first_name': 'Juan', 'last_name': 'Cruz', 'date_of_birth': '2000-01-01',
+        'email': f'{student_id}@example.com', 'section': 1, 'course': 'BSIT', 'year_level': '1st Year',
+    }
+    fields.update(kwargs)
+    return Student.objects.create(student_id=student_id, **fields)
+
+
+# --- Roster Import Tests ---
+ROSTER_HEADER = 'student_id,first_name,last_name,gender,date_of_birth,email,section,course,year_level\n'
+
+
+def roster_csv(*rows):
+    return ROSTER_HEADER + ''.join(f'{row}\n' for row in rows)
+
+
+def roster_row(student_id, **kwargs):
+    fields = {
+        'first_name': 'Ana', 'last_name': 'Santos', 'gender': 'Female', 'date_of_birth': '2001-02-03',
+        'email': f'{student_id}@example.com', 'section': '1', 'course': 'BSIT', 'year_level': '1st Year',
+    }
+    fields.update(kwargs)
+    return ','.join([student_id] + list(fields.values()))
+
+
+def png_bytes():
+    buffer = BytesIO()
+    Image.new('RGB', (2, 2), 'red').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def photo_zip(**members):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+class RosterImportTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def run_import(self, csv_text, photos=None, **kwargs):
+        return list(import_roster(StringIO(csv_text), photo_archive=photos, **kwargs))
+
+    def row_errors(self, events):
+        return {
+            error.get('student_id'): error['errors']
+            for event in events if event['event'] == 'progress'
+            for error in event['errors']
+        }
+
+    def test_event_sequence(self):
+        events = self.run_import(roster_csv(roster_row('2001'), roster_row('2002'), roster_row('2003')), chunk_size=2)
+        self.assertEqual([e['event'] for e in events], ['start', 'progress', 'progress', 'done'])
+        self.assertEqual(events[0], {'event': 'start', 'total': 3, 'photos': 0})
+        self.assertEqual([e['processed'] for e in events[1:3]], [2, 3])
+        self.assertEqual(events[-1], {'event': 'done', 'total': 3, 'created': 3, 'skipped': 0})
+        self.assertEqual(Student.objects.get(student_id='2002').first_name, 'Ana')
+
+    def test_duplicates_within_roster_skipped(self):
+        events = self.run_import(roster_csv(
+            roster_row('2001'),
+            roster_row('2001', email='other@example.com'),
+            roster_row('2002', email='2001@example.com'),
+        ))
+        self.assertEqual(events[-1]['created'], 1)
+        self.assertEqual(events[-1]['skipped'], 2)
+        errors = events[1]['errors']
+        self.assertEqual([e['line'] for e in errors], [3, 4])
+        self.assertIn('student_id', errors[0]['errors'])
+        self.assertIn('email', errors[1]['errors'])
+
+    def test_duplicates_against_database_skipped(self):
+        make_student('2001')
+        make_student('3001', email='taken@example.com')
+        events = self.run_import(roster_csv(roster_row('2001'), roster_row('2002', email='taken@example.com')))
+        self.assertEqual(events[-1]['created'], 0)
+        errors = self.row_errors(events)
+        self.assertIn('student_id', errors['2001'])
+        self.assertIn('email', errors['2002'])
+
+    def test_choice_and_date_validation(self):
+        events = self.run_import(roster_csv(
+            roster_row('2001', course='BSXX'),
+            roster_row('2002', year_level='9th Year'),
+            roster_row('2003', date_of_birth='03/02/2001'),
+            roster_row('2004', gender=''),
+        ))
+        errors = self.row_errors(events)
+        self.assertEqual(set(errors), {'2001', '2002', '2003'})
+        self.assertIn('course', errors['2001'])
+        self.assertIn('year_level', errors['2002'])
+        self.assertIn('date_of_birth', errors['2003'])
+        self.assertEqual(Student.objects.get(student_id='2004').gender, 'Other')
+
+    def test_missing_columns_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'email'):
+            self.run_import('student_id,first_name\n2001,Ana\n')
+
+    def test_photos_attached_by_student_id(self):
+        photos = photo_zip(**{'photos/2001.PNG': png_bytes(), '2002.jpg': b'not an image', 'notes.txt': b''})
+        events = self.run_import(roster_csv(roster_row('2001'), roster_row('2002')), photos=photos)
+        self.assertEqual(events[0]['photos'], 2)
+        self.assertEqual(events[-1]['created'], 2)
+        self.assertEqual(self.row_errors(events), {'2002': {'image': ['Photo is not a valid image.']}})
+        image = Student.objects.get(student_id='2001').image
+        self.assertRegex(image.name, r'^student_images/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertTrue(os.path.exists(image.path))
+        self.assertFalse(Student.objects.get(student_id='2002').image)
+
+    def test_corrupt_photo_reported_as_row_error(self):
+        photos = photo_zip(**{'2001.png': png_bytes()}).getvalue()
+        # Flip a byte of the stored image data so its CRC no longer matches
+        offset = photos.index(b'PNG')
+        photos = photos[:offset] + b'X' + photos[offset + 1:]
+        events = self.run_import(roster_csv(roster_row('2001')), photos=BytesIO(photos))
+        self.assertEqual(events[-1], {'event': 'done', 'total': 1, 'created': 1, 'skipped': 0})
+        self.assertEqual(self.row_errors(events), {'2001': {'image': ['Photo could not be read from the archive.']}})
+
+    def test_endpoint_streams_ndjson(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        roster = SimpleUploadedFile('roster.csv', roster_csv(roster_row('2001'), roster_row('2001')).encode())
+        response = client.post('/api/students/import/', {'roster': roster, 'chunk_size': 1}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        events = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([e['event'] for e in events], ['start', 'progress', 'progress', 'done'])
+        self.assertEqual(events[-1]['created'], 1)
+
+    def test_endpoint_rejects_bad_archive(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        response = client.post('/api/students/import/', {
+            'roster': SimpleUploadedFile('roster.csv', roster_csv(roster_row('2001')).encode()),
+            'photos': SimpleUploadedFile('photos.zip', b'not a zip'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Student.objects.exists())
+
+    def test_command_rejects_bad_archive(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        roster, photos = os.path.join(directory, 'roster.csv'), os.path.join(directory, 'photos.zip')
+        with open(roster, 'w') as f:
+            f.write(roster_csv(roster_row('2001')))
+        with open(photos, 'wb') as f:
+            f.write(b'not a zip')
+        with self.assertRaises(CommandError):
+            call_command('import_roster', roster, photos=photos, stdout=StringIO(), stderr=StringIO())
+
+
+# --- Term Tests ---
+class TermScopingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        self.old = Term.objects.create(code='2024-1', name='1st Semester 2024')
+        self.current = Term.objects.create(code='2024-2', name='2nd Semester 2024', is_current=True)
+        self.student = make_student('1001')
+        self.subject = Subject.objects.create(code='CS101', name='Programming 1', units=3)
+        Grade.objects.create(student=self.student, subject=self.subject, term=self.old, activity_grade=80, quiz_grade=80, exam_grade=80)
+        Grade.objects.create(student=self.student, subject=self.subject, term=self.current, activity_grade=90, quiz_grade=90, exam_grade=90)
+
+    def grade_terms(self, query=''):
+        response = self.client.get(f'/api/grades/{query}')
+        self.assertEqual(response.status_code, 200)
+        return sorted(g['term'] for g in response.data)
+
+    def test_list_defaults_to_current_term(self):
+        self.assertEqual(self.grade_terms(), ['2024-2'])
+
+    def test_term_all_disables_scoping(self):
+        self.assertEqual(self.grade_terms('?term=all'), ['2024-1', '2024-2'])
+
+    def test_term_code_selects_term(self):
+        self.assertEqual(self.grade_terms('?term=2024-1'), ['2024-1'])
+
+    def test_only_one_current_term(self):
+        self.old.is_current = True
+        self.old.save()
+        self.assertEqual(list(Term.objects.filter(is_current=True)), [self.old])
+
+    def test_duplicate_grade_in_term_rejected(self):
+        data = {'student': '1001', 'subject': 'CS101', 'activity_grade': 70, 'quiz_grade': 70, 'exam_grade': 70}
+        response = self.client.post('/api/grades/', data)
+        self.assertEqual(response.status_code, 400)
+
+    def test_grade_creation_requires_current_term(self):
+        Term.objects.update(is_current=False)
+        Grade.objects.all().delete()
+        data = {'student': '1001', 'subject': 'CS101', 'activity_grade': 70, 'quiz_grade': 70, 'exam_grade': 70}
+        self.assertEqual(self.client.post('/api/grades/', data).status_code, 400)
+        self.assertEqual(self.client.post('/api/grades/', data).status_code, 400)
+        self.assertFalse(Grade.objects.exists())
+
+    def test_enroll_requires_current_term(self):
+        Term.objects.update(is_current=False)
+        response = self.client.post('/api/api/students/1001/enroll/', {'subject_code': 'CS101'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_anonymous_cannot_write_terms(self):
+        response = APIClient().post('/api/terms/', {'code': '2025-1', 'name': 'New', 'is_current': True})
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Term.objects.filter(code='2025-1').exists())
+
+    def test_student_cannot_write_terms(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('1001', password='pass'))
+        self.assertEqual(client.get('/api/terms/').status_code, 200)
+        response = client.post('/api/terms/', {'code': '2025-1', 'name': 'New', 'is_current': True})
+        self.assertEqual(response.status_code, 403)
+
+
+class ArchiveTermTests(TestCase):
+    def setUp(self):
+        self.old = Term.objects.create(code='2024-1', name='1st Semester 2024')
+        self.current = Term.objects.create(code='2024-2', name='2nd Semester 2024', is_current=True)
+        self.student = make_student('1001')
+        self.cs101 = Subject.objects.create(code='CS101', name='Programming 1', units=3)
+        self.cs102 = Subject.objects.create(code='CS102', name='Programming 2', units=2)
+        Grade.objects.create(student=self.student, subject=self.cs101, term=self.old, activity_grade=90, quiz_grade=80, exam_grade=70)
+        Grade.objects.create(student=self.student, subject=self.cs102, term=self.current, activity_grade=85, quiz_grade=85, exam_grade=85)
+        Enrollment.objects.create(student=self.student, subject=self.cs101, term=self.old)
+        Enrollment.objects.create(student=self.student, subject=self.cs102, term=self.current)
+
+    def test_archive_moves_rows(self):
+        call_command('archive_term', '2024-1', batch_size=1, stdout=StringIO())
+
+        self.assertFalse(Grade.objects.filter(term=self.old).exists())
+        self.assertFalse(Enrollment.objects.filter(term=self.old).exists())
+        self.assertEqual(Grade.objects.filter(term=self.current).count(), 1)
+        archived = ArchivedGrade.objects.get()
+        self.assertEqual((archived.student_id, archived.subject_code, archived.term_id), ('1001', 'CS101', '2024-1'))
+        self.assertEqual(archived.units, Decimal('3.0'))
+        self.assertEqual(archived.final_grade, Decimal('79.00'))
+        self.assertEqual(ArchivedEnrollment.objects.get().subject_code, 'CS101')
+        self.old.refresh_from_db()
+        self.assertTrue(self.old.is_archived)
+
+    def test_current_term_cannot_be_archived(self):
+        with self.assertRaises(CommandError):
+            call_command('archive_term', '2024-2')
+        self.assertEqual(Grade.objects.count(), 2)
+
+    def test_archived_term_cannot_be_archived_again(self):
+        call_command('archive_term', '2024-1', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('archive_term', '2024-1')
+
+    def test_archived_term_cannot_be_made_current(self):
+        call_command('archive_term', '2024-1', stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        response = client.patch('/api/terms/2024-1/', {'is_current': True}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('is_current', response.data)
+        self.assertTrue(Term.objects.get(code='2024-2').is_current)
+
+    def test_transcript_merges_live_and_archived_grades(self):
+        call_command('archive_term', '2024-1', stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+
+        response = client.get('/api/students/1001/transcript/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(e['term'], e['subject_code'], e['final_grade'], e['archived']) for e in response.data],
+            [('2024-1', 'CS101', '79.00', True), ('2024-2', 'CS102', '85.00', False)],
+        )
+
+
+class LegacyTermMigrationTests(TransactionTestCase):
+    before = [('core', '0002_enrollment')]
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.latest = self.executor.loader.graph.leaf_nodes('core')
+        self.executor.migrate(self.before)
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.latest)
+
+    def test_existing_rows_get_legacy_term(self):
+        apps = self.executor.loader.project_state(self.before).apps
+        OldStudent = apps.get_model('core', 'Student')
+        OldSubject = apps.get_model('core', 'Subject')
+        student = OldStudent.objects.create(
+            student_id='1001', first_name='Juan', last_name='Cruz', date_of_birth='2000-01-01',
+            email='1001@example.com', section=1, course='BSIT', year_level='1st Year',
+        )
+        subject = OldSubject.objects.create(code='CS101', name='Programming 1', units=3)
+        apps.get_model('core', 'Grade').objects.create(student=student, subject=subject, activity_grade=80, quiz_grade=80, exam_grade=80)
+        apps.get_model('core', 'Enrollment').objects.create(student=student, subject=subject)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.latest)
+
+        legacy = Term.objects.get(code='legacy')
+        self.assertTrue(legacy.is_current)
+        self.assertEqual(Grade.objects.get().term, legacy)
+        self.assertEqual(Enrollment.objects.get().term, legacy)
+
+
+# --- Report Card Tests ---
+class ReportCardTests(TestCase):
+    def setUp(self):
+        self.old = Term.objects.create(code='2024-1', name='1st Semester 2024')
+        self.current = Term.objects.create(code='2024-2', name='2nd Semester 2024', is_current=True)
+        self.graded = make_student('1001', section=2)
+        self.ungraded = make_student('1002', section=2)
+        make_student('1003', section=3)
+        cs101 = Subject.objects.create(code='CS101', name='Programming 1', units=3)
+        cs102 = Subject.objects.create(code='CS102', name='Programming 2', units=2)
+        # Final grades 79.00 (3 units) and 85.00 (2 units)
+        Grade.objects.create(student=self.graded, subject=cs101, term=self.current, activity_grade=90, quiz_grade=80, exam_grade=70)
+        Grade.objects.create(student=self.graded, subject=cs102, term=self.current, activity_grade=85, quiz_grade=85, exam_grade=85)
+        Grade.objects.create(student=self.graded, subject=cs102, term=self.old, activity_grade=60, quiz_grade=60, exam_grade=60)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+
+    def cards(self, term):
+        return {card['student']['student_id']: card for card in iter_report_cards(Student.objects.filter(section=2), term)}
+
+    def test_cards_grouped_per_student(self):
+        cards = self.cards(self.current)
+        self.assertEqual(list(cards), ['1001', '1002'])
+        self.assertEqual([g['subject_code'] for g in cards['1001']['grades']], ['CS101', 'CS102'])
+        self.assertEqual(cards['1001']['student']['first_name'], 'Juan')
+        self.assertEqual(cards['1002']['grades'], [])
+        self.assertEqual(cards['1002']['total_units'], 0)
+        self.assertIsNone(cards['1002']['average'])
+
+    def test_weighted_average(self):
+        card = self.cards(self.current)['1001']
+        self.assertEqual([g['final_grade'] for g in card['grades']], [79.0, 85.0])
+        self.assertEqual(card['total_units'], 5.0)
+        self.assertEqual(card['average'], 81.4)
+
+    def test_term_scoping(self):
+        self.assertEqual(len(self.cards(self.old)['1001']['grades']), 1)
+        self.assertEqual(self.cards(self.old)['1001']['average'], 60.0)
+        self.assertEqual(len(self.cards(None)['1001']['grades']), 3)
+        self.assertEqual(self.cards(None)['1001']['term'], '')
+
+    def test_endpoint_streams_zip(self):
+        response = self.client.get('/api/report-cards/?section=2&term=2024-2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Report-Card-Count'], '2')
+        archive = zipfile.ZipFile(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), ['1001.html', '1002.html'])
+        self.assertIn(b'Weighted average: 81.40', archive.read('1001.html'))
+        self.assertIn(b'No grades recorded.', archive.read('1002.html'))
+        self.assertTrue(archive.comment.startswith(b'2 report cards'))
+
+    def test_endpoint_rejects_bad_section(self):
+        self.assertEqual(self.client.get('/api/report-cards/?section=abc').status_code, 400)
+
+    def test_endpoint_unknown_term(self):
+        self.assertEqual(self.client.get('/api/report-cards/?term=1999-1').status_code, 404)
+
+    def test_command_writes_cards(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        call_command('generate_report_cards', directory, section=2, term='all', stdout=StringIO())
+        self.assertEqual(sorted(os.listdir(directory)), ['1001.html', '1002.html'])
+
+
+# --- Autocomplete Tests ---
+@override_settings(AUTOCOMPLETE_REFRESH_SECONDS=0)
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        make_student('2023001', first_name='Juan Miguel', last_name='Dela Cruz', email='jmdc@example.com')
+        make_student('2023002', first_name='Ana', last_name='Santos', email='ana.santos@example.com')
+        make_student('2024001', first_name='Ana', last_name='Reyes', email='areyes@example.com')
+        # The index is per process and outlives each test's rollback
+        student_index.build()
+
+    def ids(self, query):
+        return [entry['student_id'] for entry in student_index.search(query)]
+
+    def test_prefix_matches_every_field(self):
+        self.assertEqual(self.ids('migu'), ['2023001'])
+        self.assertEqual(self.ids('cru'), ['2023001'])
+        self.assertEqual(self.ids('JMD'), ['2023001'])
+        self.assertEqual(self.ids('ana.santos@ex'), ['2023002'])
+        self.assertEqual(self.ids('2023'), ['2023001', '2023002'])
+        self.assertEqual(self.ids('zzz'), [])
+        self.assertEqual(self.ids('  '), [])
+
+    def test_multi_word_query_matches_all_words(self):
+        self.assertEqual(self.ids('ana'), ['2023002', '2024001'])
+        self.assertEqual(self.ids('ana sa'), ['2023002'])
+        self.assertEqual(self.ids('rey an'), ['2024001'])
+
+    def test_limit(self):
+        self.assertEqual(len(student_index.search('ana', limit=1)), 1)
+
+    def test_save_and_delete_update_index(self):
+        student = Student.objects.get(student_id='2023002')
+        student.last_name = 'Villanueva'
+        student.save()
+        self.assertEqual(self.ids('vill'), ['2023002'])
+        self.assertEqual(self.ids('santos'), [])
+        make_student('2025001', first_name='Bea')
+        self.assertEqual(self.ids('bea'), ['2025001'])
+        student.delete()
+        self.assertEqual(self.ids('vill'), [])
+        self.assertEqual(self.ids('ana'), ['2024001'])
+
+    def test_refresh_picks_up_bulk_create(self):
+        Student.objects.bulk_create([Student(
+            student_id='2025002', first_name='Carlo', last_name='Lim', date_of_birth='2000-01-01',
+            email='carlo@example.com', section=1, course='BSIT', year_level='1st Year',
+        )])
+        self.assertEqual(self.ids('carlo'), [])
+        student_index.refresh()
+        self.assertEqual(self.ids('carlo'), ['2025002'])
+
+    def test_search_does_not_query(self):
+        with self.assertNumQueries(0):
+            student_index.search('ana')
+
+    def test_concurrent_first_searches_build_once(self):
+        index = StudentPrefixIndex()
+        builds = []
+
+        def build():
+            time.sleep(0.05)
+            builds.append(1)
+            index._built = True
+
+        with mock.patch.object(index, '_build', side_effect=build):
+            threads = [threading.Thread(target=index.search, args=('ana',)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(builds), 1)
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        response = client.get('/api/students/autocomplete/?q=ana+rey')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['student_id'], '2024001')
+        self.assertEqual(set(response.data[0]), {'student_id', 'first_name', 'last_name', 'course', 'year_level', 'section'})
+
+
+# --- Dashboard Tests ---
+class DashboardTests(TestCase):
+    def setUp(self):
+        self.old = Term.objects.create(code='2024-1', name='1st Semester 2024')
+        self.current = Term.objects.create(code='2024-2', name='2nd Semester 2024', is_current=True)
+        cs101 = Subject.objects.create(code='CS101', name='Programming 1', units=3)
+        cs102 = Subject.objects.create(code='CS102', name='Programming 2', units=2)
+        self.student = make_student('1001', section=2)
+        other = make_student('1002', section=2)
+        make_student('1003', section=3)
+        for subject in (cs101, cs102):
+            Enrollment.objects.create(student=self.student, subject=subject, term=self.current)
+        Enrollment.objects.create(student=other, subject=cs101, term=self.current)
+        # Final grades 79.00 (3 units) and 85.00 (2 units)
+        Grade.objects.create(student=self.student, subject=cs101, term=self.current, activity_grade=90, quiz_grade=80, exam_grade=70)
+        Grade.objects.create(student=self.student, subject=cs102, term=self.current, activity_grade=85, quiz_grade=85, exam_grade=85)
+        Grade.objects.create(student=other, subject=cs101, term=self.current, activity_grade=95, quiz_grade=95, exam_grade=95)
+        Grade.objects.create(student=self.student, subject=cs101, term=self.old, activity_grade=60, quiz_grade=60, exam_grade=60)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+
+    def section(self, query='course=BSIT&year_level=1st+Year&section=2'):
+        return self.client.get(f'/api/sections/dashboard/?{query}')
+
+    def test_student_dashboard_query_count(self):
+        # Student, current term, enrollments and grades
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/students/1001/dashboard/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_student_dashboard_summary(self):
+        data = self.client.get('/api/students/1001/dashboard/').data
+        self.assertEqual(data['term'], '2024-2')
+        self.assertEqual(data['student']['student_id'], '1001')
+        self.assertEqual([s['code'] for s in data['subjects']], ['CS101', 'CS102'])
+        self.assertEqual(data['summary'], {'enrolled_subjects': 2, 'graded_subjects': 2, 'graded_units': 5.0, 'average': 81.4})
+
+    def test_student_dashboard_term_all(self):
+        summary = self.client.get('/api/students/1001/dashboard/?term=all').data['summary']
+        self.assertEqual(summary['graded_subjects'], 3)
+        self.assertEqual(summary['average'], 73.38)
+
+    def test_student_dashboard_without_grades(self):
+        make_student('1004')
+        summary = self.client.get('/api/students/1004/dashboard/').data['summary']
+        self.assertEqual(summary, {'enrolled_subjects': 0, 'graded_subjects': 0, 'graded_units': 0.0, 'average': None})
+
+    def test_section_dashboard_query_count(self):
+        # Current term, students, enrollment counts and grades
+        with self.assertNumQueries(4):
+            response = self.section()
+        self.assertEqual(response.status_code, 200)
+
+    def test_section_dashboard_summary(self):
+        data = self.section().data
+        self.assertEqual(data['section'], {'course': 'BSIT', 'year_level': '1st Year', 'section': 2})
+        students = {s['student_id']: s for s in data['students']}
+        self.assertEqual(set(students), {'1001', '1002'})
+        self.assertEqual((students['1001']['enrolled_subjects'], students['1001']['graded_subjects'], students['1001']['average']), (2, 2, 81.4))
+        self.assertEqual((students['1002']['enrolled_subjects'], students['1002']['average']), (1, 95.0))
+        self.assertEqual(data['subjects'], [
+            {'subject': 'CS101', 'graded': 2, 'average': 87.0, 'highest': 95.0, 'lowest': 79.0},
+            {'subject': 'CS102', 'graded': 1, 'average': 85.0, 'highest': 85.0, 'lowest': 85.0},
+        ])
+
+    def test_section_dashboard_validation(self):
+        self.assertEqual(self.section('course=BSIT&year_level=1st+Year').status_code, 400)
+        self.assertEqual(self.section('course=BSIT&year_level=1st+Year&section=abc').status_code, 400)
+        self.assertEqual(self.section('course=BSIT&year_level=1st+Year&section=9').data['students'], [])
+
+    def test_section_dashboard_teachers_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('1001', password='pass'))
+        self.assertEqual(client.get('/api/sections/dashboard/?course=BSIT&year_level=1st+Year&section=2').status_code, 403)
+
+
+# --- Throttling and Load-Shedding Tests ---
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('bob', password='secret')
+
+    def login(self, username, password='wrong'):
+        return APIClient().post('/api/login/', {'username': username, 'password': password})
+
+    def test_username_throttle_returns_429(self):
+        # login_username allows 5 attempts per minute
+        with mock.patch('core.views.authenticate', return_value=None) as authenticate:
+            statuses = [self.login('bob').status_code for _ in range(6)]
+            self.assertEqual(statuses, [401] * 5 + [429])
+            # The throttled attempt never reached the password check
+            self.assertEqual(authenticate.call_count, 5)
+            # Other accounts from the same client are unaffected
+            self.assertEqual(self.login('alice').status_code, 401)
+        self.assertEqual(rejection_counts()['throttled']['login_username'], 1)
+
+
+    def test_ip_throttle_ignores_spoofed_forwarded_for(self):
+        # login_ip allows 20 attempts per minute, whatever X-Forwarded-For says
+        with mock.patch('core.views.authenticate', return_value=None):
+            statuses = [
+                APIClient().post('/api/login/', {'username': f'user{i}', 'password': 'x'}, HTTP_X_FORWARDED_FOR=f'10.0.0.{i}').status_code
+                for i in range(21)
+            ]
+        self.assertEqual(statuses, [401] * 20 + [429])
+
+    def test_ip_ident(self):
+        request = RequestFactory().post('/api/login/', HTTP_X_FORWARDED_FOR='1.2.3.4, 5.6.7.8', REMOTE_ADDR='9.9.9.9')
+        self.assertEqual(LoginIPThrottle().get_ident(request), '9.9.9.9')
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            # Only the address added by our own proxy is trusted
+            self.assertEqual(LoginIPThrottle().get_ident(request), '5.6.7.8')
+
+    def test_global_throttles_need_memory_cache(self):
+        self.assertEqual(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'], ['core.throttling.ScopedThrottle'])
+
+
+class ConcurrencyLimitTests(TestCase):
+    def fill(self, name, **kwargs):
+        InFlightCounter.objects.update_or_create(name=name, defaults={
+            'count': settings.CONCURRENCY_LIMITS[name], 'updated_at': timezone.now(), **kwargs,
+        })
+
+    def in_flight(self, name):
+        return InFlightCounter.objects.get(name=name).count
+
+    def test_over_budget_returns_503_with_retry_after(self):
+        self.fill('login')
+        updated_at = InFlightCounter.objects.get(name='login').updated_at
+        response = APIClient().post('/api/login/', {'username': 'bob', 'password': 'x'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '2')
+        # The rejected request took no slot and didn't refresh the counter
+        counter = InFlightCounter.objects.get(name='login')
+        self.assertEqual(counter.count, settings.CONCURRENCY_LIMITS['login'])
+        self.assertEqual(counter.updated_at, updated_at)
+
+    def test_slot_released_after_request(self):
+        APIClient().post('/api/login/', {'username': 'bob', 'password': 'x'})
+        self.assertEqual(self.in_flight('login'), 0)
+
+    def test_acquire_respects_limit(self):
+        self.assertEqual([_acquire('report-cards', 2) for _ in range(3)], [True, True, False])
+        self.assertEqual(self.in_flight('report-cards'), 2)
+        for _ in range(3):
+            _release('report-cards')
+        self.assertEqual(self.in_flight('report-cards'), 0)
+
+    def test_leaked_slots_expire(self):
+        self.fill('login', updated_at=timezone.now() - timedelta(seconds=IN_FLIGHT_TIMEOUT + 1))
+        response = APIClient().post('/api/login/', {'username': 'bob', 'password': 'x'})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.in_flight('login'), 0)
+
+    def test_streamed_response_holds_slot_until_closed(self):
+        from . import roster
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        seen = []
+        original = roster.import_roster
+
+        def spy(*args, **kwargs):
+            for event in original(*args, **kwargs):
+                seen.append(self.in_flight('student-import'))
+                yield event
+
+        csv = b"student_id,first_name,last_name,date_of_birth,email,section,course,year_level\n" \
+              b"1001,Juan,Cruz,2000-01-01,1001@example.com,1,BSIT,1st Year\n"
+        with mock.patch('core.roster.import_roster', spy):
+            response = client.post('/api/students/import/', {'roster': BytesIO(csv)}, format='multipart')
+            b''.join(response.streaming_content)
+        self.assertEqual(set(seen), {1})
+        self.assertEqual(self.in_flight('student-import'), 0)
+
+
+class RejectionMetricsTests(TestCase):
+    def test_counters(self):
+        InFlightCounter.objects.create(name='login', count=settings.CONCURRENCY_LIMITS['login'], updated_at=timezone.now())
+        APIClient().post('/api/login/', {'username': 'bob', 'password': 'x'})
+        APIClient().post('/api/login/', {'username': 'bob', 'password': 'x'})
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('teacher', password='pass', is_staff=True))
+        response = client.get('/api/metrics/rejections/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['overloaded']['login'], 2)
+        self.assertEqual(response.data['throttled']['grades'], 0)
+
+    def test_teachers_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('1001', password='pass'))
+        self.assertEqual(client.get('/api/metrics/rejections/').status_code, 403)
+
+
+# --- Warm-up Tests ---
+@override_settings(AUTOCOMPLETE_REFRESH_SECONDS=0)
+class WarmUpTests(TestCase):
+    def test_warm_up_phases(self):
+        self.assertEqual(list(warmup.warm_up(database=False)), ['django_setup', 'urlconf'])
+        make_student('1001', first_name='Warm')
+        timings = warmup.warm_up()
+        self.assertEqual(list(timings), ['django_setup', 'urlconf', 'database', 'autocomplete'])
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+        # The index is ready before the first search
+        self.assertTrue(student_index._built)
+        with self.assertNumQueries(0):
+            self.assertEqual(student_index.search('warm')[0]['student_id'], '1001')
+
+    def child_run(self, warm):
+        with mock.patch('sys.stdout', new_callable=StringIO) as stdout:
+            warmup._child_run('/api/subjects/', warm)
+        return json.loads(stdout.getvalue())
+
+    def test_child_run_reports_first_response(self):
+        cold = self.child_run(False)
+        self.assertEqual(cold['status'], '200 OK')
+        self.assertEqual(set(cold['timings']), {'django_setup', 'first_request', 'second_request'})
+        warm = self.child_run(True)
+        self.assertEqual(set(warm['timings']), {'django_setup', 'urlconf', 'database', 'autocomplete', 'first_request', 'second_request'})
+
+    def test_benchmark_runs_fresh_processes(self):
+        output = json.dumps({'status': '200 OK', 'timings': {'first_request': 0.01}, 'first_response_at': time.time() + 0.5})
+        completed = subprocess.CompletedProcess([], 0, stdout=f'noise\n{output}\n')
+        with mock.patch('schoolapi.warmup.subprocess.run', return_value=completed) as run:
+            results = warmup.benchmark('/api/terms/', runs=2, warm=True)
+        self.assertEqual(run.call_count, 2)
+        self.assertIn("_child_run('/api/terms/', True)", run.call_args.args[0][-1])
+        self.assertEqual(len(results), 2)
+        self.assertNotIn('first_response_at', results[0])
+        self.assertGreater(results[0]['timings']['time_to_first_response'], 0)
+
+
+# --- Media Tests ---
+class ParseRangeTests(SimpleTestCase):
+    def test_simple_range(self):
+        self.assertEqual(_parse_range('bytes=0-9', 100), (0, 9))
+
+    def test_open_ended_range(self):
+        self.assertEqual(_parse_range('bytes=90-', 100), (90, 99))
+
+    def test_end_clamped_to_size(self):
+        self.assertEqual(_parse_range('bytes=50-500', 100), (50, 99))
+
+    def test_suffix_range(self):
+        self.assertEqual(_parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(_parse_range('bytes=-500', 100), (0, 99))
+
+    def test_empty_suffix_is_invalid(self):
+        self.assertEqual(_parse_range('bytes=-0', 100), 'invalid')
+        self.assertEqual(_parse_range('bytes=-', 100), 'invalid')
+
+    def test_start_beyond_eof_is_invalid(self):
+        self.assertEqual(_parse_range('bytes=100-', 100), 'invalid')
+        self.assertEqual(_parse_range('bytes=20-10', 100), 'invalid')
+
+    def test_multiple_ranges_ignored(self):
+        self.assertIsNone(_parse_range('bytes=0-1,5-6', 100))
+
+    def test_other_units_ignored(self):
+        self.assertIsNone(_parse_range('items=0-1', 100))
+
+
+class MediaTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SENDFILE=None)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.storage = ContentAddressedStorage(location=self.media_root)
+        self.data = bytes(range(256)) * 4
+        self.name = self.storage.save('student_images/photo.JPG', ContentFile(self.data))
+        self.url = f'/media/{self.name}'
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_storage_names_by_content_hash(self):
+        self.assertRegex(self.name, r'^student_images/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+
+    def test_storage_deduplicates_identical_files(self):
+        again = self.storage.save('student_images/other.jpg', ContentFile(self.data))
+        self.assertEqual(again, self.name)
+        different = self.storage.save('student_images/photo.jpg', ContentFile(b'other bytes'))
+        self.assertNotEqual(different, self.name)
+        files = [f for _, _, names in os.walk(self.media_root) for f in names]
+        self.assertEqual(len(files), 2)
+
+    def test_concurrent_identical_upload_keeps_name(self):
+        checks = []
+
+        def exists(name):
+            # This upload got past the check in save() before the other one
+            # wrote the file; later checks see it
+            checks.append(name)
+            return len(checks) > 1 and os.path.exists(self.storage.path(name))
+
+        with mock.patch.object(self.storage, 'exists', side_effect=exists):
+            again = self.storage.save('student_images/photo.jpg', ContentFile(self.data))
+        self.assertEqual(again, self.name)
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(self.name))), [os.path.basename(self.name)])
+        with self.storage.open(self.name) as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_existing_content_addressed_name_is_available(self):
+        self.assertTrue(self.storage.exists(self.name))
+        self.assertEqual(self.storage.get_available_name(self.name), self.name)
+
+    def test_full_response_is_immutable(self):
+        response, body = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get()[0]['ETag']
+        response, body = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_range_returns_206(self):
+        response, body = self.get(HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.data)}')
+        self.assertEqual(body, self.data[10:20])
+
+    def test_suffix_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[-5:])
+
+    def test_unsatisfiable_range_returns_416(self):
+        response, _ = self.get(HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_multiple_ranges_return_full_file(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+
+    def test_if_range_with_current_etag_returns_range(self):
+        etag = self.get()[0]['ETag']
+        response, body = self.get(HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[:4])
+
+    def test_if_range_with_stale_etag_returns_full_file(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+
+    def test_legacy_file_revalidates(self):
+        with open(os.path.join(self.media_root, 'legacy.jpg'), 'wb') as f:
+            f.write(self.data)
+        response = self.client.get('/media/legacy.jpg')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+        self.assertEqual(self.client.get('/media/legacy.jpg', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_path_traversal_is_404(self):
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
+
+    def test_x_accel_redirect(self):
+        with override_settings(MEDIA_SENDFILE='x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(response.content, b'')
 
-# Create your tests here.
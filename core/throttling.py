@@ -0,0 +1,52 @@
+import hashlib
+
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, SimpleRateThrottle, UserRateThrottle
+
+from .metrics import record_rejection
+
+# --- Throttles ---
+# DRF throttles backed by the default cache. Rates are configured in
+# REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] (see settings.py).
+
+
+class RejectionMetricsMixin:
+    def allow_request(self, request, view):
+        allowed = super().allow_request(request, view)
+        if not allowed:
+            record_rejection('throttled', self.scope)
+        return allowed
+
+
+class AnonThrottle(RejectionMetricsMixin, AnonRateThrottle):
+    pass
+
+
+class UserThrottle(RejectionMetricsMixin, UserRateThrottle):
+    pass
+
+
+# Applies to views that set throttle_scope (grades, enroll, ...)
+class ScopedThrottle(RejectionMetricsMixin, ScopedRateThrottle):
+    pass
+
+
+# Login attempts per client IP. The address comes from REMOTE_ADDR, or from
+# X-Forwarded-For only as far as REST_FRAMEWORK['NUM_PROXIES'] trusts it.
+class LoginIPThrottle(RejectionMetricsMixin, SimpleRateThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+# Login attempts per username, whatever IP they come from. Throttles run
+# before the view, so rejected attempts never reach the password hasher.
+class LoginUsernameThrottle(RejectionMetricsMixin, SimpleRateThrottle):
+    scope = 'login_username'
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username')
+        if not username:
+            return None
+        ident = hashlib.sha256(str(username).lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
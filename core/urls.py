@@ -1,15 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import StudentViewSet, SubjectViewSet, GradeViewSet, RegisterView, LoginView, EnrollmentViewSet, StudentEnrollmentsAPIView, EnrollSubjectAPIView, UnenrollSubjectAPIView
-from django.views.decorators.csrf import ensure_csrf_cookie
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from .views import CsrfTokenView
-
-print("=== core/urls.py loaded ===")
-
-
+from .views import CsrfTokenView, StudentRosterImportAPIView, TermViewSet, ReportCardsAPIView, SectionDashboardAPIView, RejectionMetricsAPIView
 
 
 router = DefaultRouter()
@@ -17,13 +9,18 @@ router.register(r'students', StudentViewSet) # /api/students/, /api/students/{st
 router.register(r'subjects', SubjectViewSet) # /api/subjects/, /api/subjects/{code}/
 router.register(r'grades', GradeViewSet)     # /api/grades/, /api/grades/{id}/
 router.register(r'enrollments', EnrollmentViewSet)
+router.register(r'terms', TermViewSet)         # /api/terms/, /api/terms/{code}/
 
 urlpatterns = [
     
+    path('students/import/', StudentRosterImportAPIView.as_view(), name='student-import'),
     path('', include(router.urls)),
     path('register/', RegisterView.as_view(), name='register'), 
     path('login/', LoginView.as_view(), name='login'),       
     path('csrf/', CsrfTokenView.as_view(), name='csrf'),
+    path('report-cards/', ReportCardsAPIView.as_view(), name='report-cards'),
+    path('sections/dashboard/', SectionDashboardAPIView.as_view(), name='section-dashboard'),
+    path('metrics/rejections/', RejectionMetricsAPIView.as_view(), name='rejection-metrics'),
     path('api/students/<str:student_id>/enrollments/', StudentEnrollmentsAPIView.as_view(), name='student-enrollments'),
     path('api/students/<str:student_id>/enroll/', EnrollSubjectAPIView.as_view(), name='student-enroll'),
     path('api/students/<str:student_id>/unenroll/', UnenrollSubjectAPIView.as_view(), name='student-unenroll'),
@@ -3,16 +3,26 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.models import User
-from .models import Student, Subject, Grade, Enrollment
-from .serializers import StudentSerializer, SubjectSerializer, GradeSerializer, UserSerializer, EnrollmentSerializer
+from .models import Student, Subject, Grade, Enrollment, Term, ArchivedGrade
+from .serializers import StudentSerializer, SubjectSerializer, GradeSerializer, UserSerializer, EnrollmentSerializer, TermSerializer, TranscriptEntrySerializer, DashboardGradeSerializer, DashboardStudentSerializer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.http import JsonResponse
 from django.views.decorators.csrf import ensure_csrf_cookie
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import BasePermission, SAFE_METHODS
+from rest_framework.parsers import MultiPartParser
+from .throttling import LoginIPThrottle, LoginUsernameThrottle
+from .metrics import rejection_counts
+from django.http import StreamingHttpResponse
+from django.db.models import Count
+import json
+import logging
+import zipfile
 
 from rest_framework.views import APIView
 
+logger = logging.getLogger(__name__)
+
 class CsrfTokenView(APIView):
     permission_classes = []
     def get(self, request):
@@ -22,6 +32,37 @@ class IsTeacher(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated and request.user.is_staff
 
+# Any authenticated user can read; only teachers can write
+class IsTeacherOrReadOnly(BasePermission):
+    def has_permission(self, request, view):
+        if request.method in SAFE_METHODS:
+            return bool(request.user and request.user.is_authenticated)
+        return IsTeacher().has_permission(request, view)
+
+# Scopes grade/enrollment querysets to a term: ?term=<code> selects one,
+# ?term=all disables scoping, and by default the current term is used.
+def term_filter(request):
+    code = request.query_params.get('term')
+    if code == 'all':
+        return {}
+    if code:
+        return {'term_id': code}
+    current = Term.current()
+    if current is None:
+        return {}
+    return {'term': current}
+
+def filter_by_term(queryset, request):
+    return queryset.filter(**term_filter(request))
+
+# --- Term ViewSet ---
+class TermViewSet(viewsets.ModelViewSet):
+    queryset = Term.objects.all()
+    serializer_class = TermSerializer
+    lookup_field = 'code'
+    # Changing the current term re-scopes every grade/enrollment listing
+    permission_classes = [IsTeacherOrReadOnly]
+
 # --- Student ViewSet ---
 class StudentViewSet(viewsets.ModelViewSet):
     queryset = Student.objects.all()
@@ -34,14 +75,217 @@ class StudentViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
+    # Type-ahead lookup: /api/students/autocomplete/?q=<text>&limit=<n>
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def autocomplete(self, request):
+        from .autocomplete import student_index
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        return Response(student_index.search(request.query_params.get('q', ''), limit))
+
+    # Everything a student's home page needs in one response: profile,
+    # enrolled subjects and grades for the term, plus a summary.
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def dashboard(self, request, student_id=None):
+        student = self.get_object()
+        scope = term_filter(request)
+        enrollments = Enrollment.objects.filter(student=student, **scope).select_related('subject')
+        grades = list(Grade.objects.filter(student=student, **scope).select_related('subject'))
+
+        total_units = float(sum(g.subject.units for g in grades))
+        average = (
+            round(sum(g.final_grade * float(g.subject.units) for g in grades) / total_units, 2)
+            if total_units else None
+        )
+        return Response({
+            'student': StudentSerializer(student, context=self.get_serializer_context()).data,
+            'term': scope['term'].code if 'term' in scope else request.query_params.get('term'),
+            'subjects': SubjectSerializer([e.subject for e in enrollments], many=True).data,
+            'grades': DashboardGradeSerializer(grades, many=True).data,
+            'summary': {
+                'enrolled_subjects': len(enrollments),
+                'graded_subjects': len(grades),
+                'graded_units': total_units,
+                'average': average,
+            },
+        })
+
+    # Full academic history: live grades from every term plus archived terms
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def transcript(self, request, student_id=None):
+        student = self.get_object()
+        entries = [
+            {
+                'term': grade.term_id,
+                'subject_code': grade.subject_id,
+                'units': grade.subject.units,
+                'activity_grade': grade.activity_grade,
+                'quiz_grade': grade.quiz_grade,
+                'exam_grade': grade.exam_grade,
+                'final_grade': round(grade.final_grade, 2),
+                'archived': False,
+            }
+            for grade in Grade.objects.filter(student=student).select_related('subject')
+        ]
+        entries += [
+            {
+                'term': grade.term_id,
+                'subject_code': grade.subject_code,
+                'units': grade.units,
+                'activity_grade': grade.activity_grade,
+                'quiz_grade': grade.quiz_grade,
+                'exam_grade': grade.exam_grade,
+                'final_grade': grade.final_grade,
+                'archived': True,
+            }
+            for grade in ArchivedGrade.objects.filter(student_id=student.student_id)
+        ]
+        entries.sort(key=lambda e: (e['term'], e['subject_code']))
+        return Response(TranscriptEntrySerializer(entries, many=True).data)
+
+# --- Roster Import View ---
+# Accepts a CSV roster ("roster") and an optional ZIP of photos ("photos") and
+# streams newline-delimited JSON progress events while the import runs.
+class StudentRosterImportAPIView(APIView):
+    permission_classes = [IsTeacher]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        from .roster import import_roster
+
+        roster = request.FILES.get('roster')
+        if roster is None:
+            return Response({'message': 'A roster CSV file is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chunk_size = int(request.data.get('chunk_size', 500))
+        except (TypeError, ValueError):
+            return Response({'message': 'chunk_size must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        events = import_roster(roster, photo_archive=request.FILES.get('photos'), chunk_size=max(chunk_size, 1))
+        try:
+            # Pull the first event eagerly so header/archive problems become a 400
+            first = next(events)
+        except (ValueError, zipfile.BadZipFile) as e:
+            return Response({'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def stream():
+            yield json.dumps(first) + '\n'
+            for event in events:
+                yield json.dumps(event) + '\n'
+
+        return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+# --- Report Card View ---
+# Returns a ZIP of HTML report cards for a cohort, filtered by course,
+# year_level and section, for ?term=<code> (default current, or "all").
+class ReportCardsAPIView(APIView):
+    permission_classes = [IsTeacher]
+
+    def get(self, request):
+        from .report_cards import stream_report_card_archive
+
+        students = Student.objects.all()
+        for field in ('course', 'year_level'):
+            value = request.query_params.get(field)
+            if value:
+                students = students.filter(**{field: value})
+        section = request.query_params.get('section')
+        if section:
+            try:
+                students = students.filter(section=int(section))
+            except ValueError:
+                return Response({'message': 'section must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        code = request.query_params.get('term')
+        if code == 'all':
+            term = None
+        elif code:
+            term = Term.objects.filter(code=code).first()
+            if term is None:
+                return Response({'message': 'Term not found.'}, status=status.HTTP_404_NOT_FOUND)
+        else:
+            term = Term.current()
+
+        # Streamed and rendered in this process; use the generate_report_cards
+        # command for a parallel run over a whole school
+        response = StreamingHttpResponse(stream_report_card_archive(students, term), content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="report-cards.zip"'
+        response['X-Report-Card-Count'] = str(students.count())
+        return response
+
+# --- Section Dashboard View ---
+# Teacher overview of one section (?course=&year_level=&section=): its students
+# with enrollment counts and averages, and per-subject grade statistics.
+class SectionDashboardAPIView(APIView):
+    permission_classes = [IsTeacher]
+
+    def get(self, request):
+        params = {field: request.query_params.get(field) for field in ('course', 'year_level', 'section')}
+        if not all(params.values()):
+            return Response({'message': 'course, year_level and section are required.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            params['section'] = int(params['section'])
+        except ValueError:
+            return Response({'message': 'section must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        scope = term_filter(request)
+        students = list(Student.objects.filter(**params))
+        section_filter = {f'student__{field}': value for field, value in params.items()}
+        enrolled = dict(
+            Enrollment.objects.filter(**section_filter, **scope)
+            .values_list('student_id').annotate(count=Count('id')).order_by()
+        )
+        grade_rows = (
+            Grade.objects.filter(**section_filter, **scope)
+            .values_list('student_id', 'subject_id', 'subject__units', 'activity_grade', 'quiz_grade', 'exam_grade')
+        )
+
+        by_student = {}
+        by_subject = {}
+        for student_id, subject_code, units, activity, quiz, exam in grade_rows:
+            final = Grade(activity_grade=activity, quiz_grade=quiz, exam_grade=exam).final_grade
+            by_student.setdefault(student_id, []).append((final, float(units)))
+            by_subject.setdefault(subject_code, []).append(final)
+
+        def weighted(entries):
+            units = sum(u for _, u in entries)
+            return round(sum(f * u for f, u in entries) / units, 2) if units else None
+
+        return Response({
+            'section': params,
+            'term': scope['term'].code if 'term' in scope else request.query_params.get('term'),
+            'students': [
+                {
+                    **DashboardStudentSerializer(student).data,
+                    'enrolled_subjects': enrolled.get(student.student_id, 0),
+                    'graded_subjects': len(by_student.get(student.student_id, [])),
+                    'average': weighted(by_student.get(student.student_id, [])),
+                }
+                for student in students
+            ],
+            'subjects': [
+                {
+                    'subject': code,
+                    'graded': len(finals),
+                    'average': round(sum(finals) / len(finals), 2),
+                    'highest': round(max(finals), 2),
+                    'lowest': round(min(finals), 2),
+                }
+                for code, finals in sorted(by_subject.items())
+            ],
+        })
+
 class StudentEnrollmentsAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, student_id):
         # You may want to check permissions here!
-        enrollments = Enrollment.objects.filter(student__student_id=student_id)
+        enrollments = filter_by_term(Enrollment.objects.filter(student__student_id=student_id), request)
         # Return just subject codes, or serialize as needed
-        subject_codes = [e.subject.code for e in enrollments]
+        subject_codes = list(enrollments.values_list('subject_id', flat=True))
         return Response(subject_codes)
 
 
@@ -56,6 +300,14 @@ class SubjectViewSet(viewsets.ModelViewSet):
 class GradeViewSet(viewsets.ModelViewSet):
     queryset = Grade.objects.all()
     serializer_class = GradeSerializer
+    throttle_scope = 'grades'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Listing defaults to the current term; detail lookups can reach any term
+        if self.action == 'list':
+            queryset = filter_by_term(queryset, self.request)
+        return queryset
 
     def create(self, request, *args, **kwargs):
         student_id = request.data.get('student') 
@@ -108,6 +360,8 @@ class GradeViewSet(viewsets.ModelViewSet):
     
 # --- User Registration View ---
 class RegisterView(APIView):
+    throttle_scope = 'register'
+
     def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
@@ -149,27 +403,32 @@ class RegisterView(APIView):
 # --- User Login View ---
 # Handles user authentication and returns role and student_id (if student).
 class LoginView(APIView):
+    # Per-IP and per-username limits are checked before any password hashing
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
     def post(self, request):
-        print("=== LoginView POST called ===")
-        print("Request data:", request.data)
         try:
             username = request.data.get("username")
             password = request.data.get("password")
-            print("Username:", username, "Password:", password)
             user = authenticate(request, username=username, password=password)
-            print("User:", user)
             if user is not None:
                 login(request, user)
-                print("Login successful")
                 return Response({"success": True})
-            print("Login failed")
             return Response({"success": False, "error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
         except Exception as e:
-            import traceback
-            print("Exception in LoginView:", e)
-            traceback.print_exc()
+            logger.exception("Exception in LoginView")
             return Response({"success": False, "error": str(e)}, status=500)
 
+# --- Rejection Metrics View ---
+# Counts of requests rejected by throttles ("throttled") and by the
+# concurrency limiter ("overloaded"), per scope/route.
+class RejectionMetricsAPIView(APIView):
+    permission_classes = [IsTeacher]
+    throttle_classes = []
+
+    def get(self, request):
+        return Response(rejection_counts())
+
 class EnrollmentViewSet(viewsets.ModelViewSet):
     queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
@@ -178,6 +437,8 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     # Optionally, to allow users to only see/manage their own enrollments
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = filter_by_term(queryset, self.request)
         # If the user is a student, filter to show only their enrollments
         if self.request.user.is_authenticated and hasattr(self.request.user, 'student_profile'):
             # Assuming your User model has a one-to-one link to a StudentProfile or Student model
@@ -211,6 +472,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
 class EnrollSubjectAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'enroll'
 
     def post(self, request, student_id):
         subject_code = request.data.get('subject_code')
@@ -219,10 +481,13 @@ class EnrollSubjectAPIView(APIView):
         try:
             student = Student.objects.get(student_id=student_id)
             subject = Subject.objects.get(code=subject_code)
-            # Prevent duplicate enrollments
-            if Enrollment.objects.filter(student=student, subject=subject).exists():
+            term = Term.current()
+            if term is None:
+                return Response({'message': 'No current term is set.'}, status=status.HTTP_400_BAD_REQUEST)
+            # Prevent duplicate enrollments within the term
+            if Enrollment.objects.filter(student=student, subject=subject, term=term).exists():
                 return Response({'message': 'Already enrolled in this subject.'}, status=status.HTTP_400_BAD_REQUEST)
-            Enrollment.objects.create(student=student, subject=subject)
+            Enrollment.objects.create(student=student, subject=subject, term=term)
             return Response({'message': 'Enrolled successfully.'}, status=status.HTTP_201_CREATED)
         except Student.DoesNotExist:
             return Response({'message': 'Student not found.'}, status=status.HTTP_404_NOT_FOUND)
@@ -231,6 +496,7 @@ class EnrollSubjectAPIView(APIView):
 
 class UnenrollSubjectAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'enroll'
 
     def post(self, request, student_id):
         subject_code = request.data.get('subject_code')
@@ -239,7 +505,10 @@ class UnenrollSubjectAPIView(APIView):
         try:
             student = Student.objects.get(student_id=student_id)
             subject = Subject.objects.get(code=subject_code)
-            enrollment = Enrollment.objects.filter(student=student, subject=subject)
+            term = Term.current()
+            if term is None:
+                return Response({'message': 'No current term is set.'}, status=status.HTTP_400_BAD_REQUEST)
+            enrollment = Enrollment.objects.filter(student=student, subject=subject, term=term)
             if not enrollment.exists():
                 return Response({'message': 'Not enrolled in this subject.'}, status=status.HTTP_400_BAD_REQUEST)
             enrollment.delete()
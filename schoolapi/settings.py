@@ -35,6 +35,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ConcurrencyLimitMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -71,6 +72,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests so the one opened by the
+        # gunicorn post_fork warm-up is reused instead of reconnecting
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
     
 }
@@ -117,6 +122,29 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    # Student photos are stored by content hash (deduplicated, immutable names)
+    'student_images': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+}
+
+# Media files are served by core.media.serve_media with caching headers,
+# ETags and range support. Content-addressed files are cached for a year as
+# immutable; other (legacy) files for MEDIA_CACHE_MAX_AGE seconds.
+MEDIA_CACHE_MAX_AGE = 3600
+# Hand the file transfer to the front server: None, 'x-sendfile' (Apache
+# mod_xsendfile, lighttpd) or 'x-accel-redirect' (nginx, with an internal
+# location mapping MEDIA_ACCEL_REDIRECT_PREFIX to MEDIA_ROOT).
+MEDIA_SENDFILE = os.environ.get('MEDIA_SENDFILE') or None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -155,8 +183,66 @@ LOGGING = {
     },
 }
 
+# Cache
+# Throttle counters and rejection metrics live here, so it must be shared by
+# every worker process. The default is the database cache (its table is
+# created by core's migrations); point DJANGO_CACHE_BACKEND and
+# DJANGO_CACHE_LOCATION at e.g. RedisCache for higher traffic.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'core_cache'),
+    }
+}
+
+# Throttle rates per scope, overridable with THROTTLE_RATE_<SCOPE> (e.g. THROTTLE_RATE_LOGIN_IP=10/min)
+THROTTLE_RATES = {
+    'anon': '300/min',
+    'user': '600/min',
+    'grades': '120/min',
+    'enroll': '30/min',
+    'register': '10/min',
+    'login_ip': '20/min',
+    'login_username': '5/min',
+}
+
+# The global anon/user throttles read and write the cache on every API
+# request, so they are only enabled with an in-memory shared cache (Redis or
+# Memcached). On the database cache only the named scopes (login, grades,
+# enroll, register) are throttled.
+MEMORY_CACHE = any(name in CACHES['default']['BACKEND'].lower() for name in ('redis', 'memcache'))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
-}
\ No newline at end of file
+    'DEFAULT_THROTTLE_CLASSES': (
+        ['core.throttling.AnonThrottle', 'core.throttling.UserThrottle'] if MEMORY_CACHE else []
+    ) + ['core.throttling.ScopedThrottle'],
+    'DEFAULT_THROTTLE_RATES': {
+        scope: os.environ.get(f'THROTTLE_RATE_{scope.upper()}', rate)
+        for scope, rate in THROTTLE_RATES.items()
+    },
+    # Proxies in front of the app, used by the throttles to find the client
+    # address in X-Forwarded-For. Render adds one; with 0 the header is
+    # ignored and REMOTE_ADDR is used, so clients can't spoof their address.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '1' if os.environ.get('RENDER') else '0')),
+}
+
+# Maximum in-flight requests per URL name before ConcurrencyLimitMiddleware
+# answers 503 with Retry-After (CONCURRENCY_RETRY_AFTER seconds)
+CONCURRENCY_LIMITS = {
+    'login': 4,
+    'grade-list': 8,
+    'grade-detail': 8,
+    'student-enroll': 8,
+    'student-unenroll': 8,
+    'report-cards': 1,
+    'student-import': 1,
+}
+CONCURRENCY_RETRY_AFTER = 2
+
+# How often (seconds) a background thread in each process checks whether its
+# in-memory student autocomplete index is stale (e.g. rows written by another
+# worker); 0 disables the check
+AUTOCOMPLETE_REFRESH_SECONDS = 60
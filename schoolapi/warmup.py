@@ -0,0 +1,122 @@
+"""
+Warm-up and cold-start measurement for the web process.
+
+``warm_up()`` does the work the first request would otherwise pay for:
+Django setup, importing the URLconf (and with it every view, serializer and
+DRF/simplejwt module), compiling URL patterns, opening database
+connections and building the student autocomplete index. gunicorn.conf.py calls it in the master before forking and from
+``post_fork`` in each worker.
+
+Two modules are deliberately left out and imported by their views on first
+use: core.roster (Pillow, ~17 ms to import) and core.report_cards (~5 ms).
+Most workers never serve a roster import or a report-card run.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def _compile_patterns(patterns):
+    # Accessing .regex compiles (and caches) each pattern's regular expression
+    for entry in patterns:
+        entry.pattern.regex
+        if hasattr(entry, 'url_patterns'):
+            _compile_patterns(entry.url_patterns)
+
+
+def warm_up(database=True):
+    """
+    Runs each warm-up phase and returns their durations in seconds.
+
+    Pass ``database=False`` in a process that will fork (e.g. the gunicorn
+    master), since connections must not be shared with the children.
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schoolapi.settings')
+    from schoolapi.wsgi import application  # noqa: F401  (runs django.setup())
+    timings['django_setup'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    from django.urls import get_resolver
+    resolver = get_resolver()
+    _compile_patterns(resolver.url_patterns)
+    resolver.reverse_dict  # Populates the reverse lookup tables
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    JWTAuthentication()  # Loads simplejwt settings and the token backend
+    timings['urlconf'] = time.perf_counter() - started
+
+    if not database:
+        return timings
+
+    started = time.perf_counter()
+    from django.db import connections
+    for connection in connections.all():
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    timings['database'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    from core.autocomplete import student_index
+    student_index.ensure_built()
+    timings['autocomplete'] = time.perf_counter() - started
+
+    return timings
+
+
+# --- Cold start benchmark ---
+# Each run starts a fresh interpreter, so imports and connections are cold.
+
+def _child_run(path, warm):
+    timings = {}
+    if warm:
+        timings.update(warm_up())
+    started = time.perf_counter()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schoolapi.settings')
+    from schoolapi.wsgi import application
+    if not warm:
+        timings['django_setup'] = time.perf_counter() - started
+
+    def request():
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+            'wsgi.url_scheme': 'http', 'wsgi.input': sys.stdin.buffer, 'wsgi.errors': sys.stderr,
+        }
+        statuses = []
+        started = time.perf_counter()
+        body = application(environ, lambda status, headers: statuses.append(status))
+        b''.join(body)
+        body.close()
+        return statuses[0], time.perf_counter() - started
+
+    status, timings['first_request'] = request()
+    first_response_at = time.time()
+    _, timings['second_request'] = request()
+    print(json.dumps({'status': status, 'timings': timings, 'first_response_at': first_response_at}))
+
+
+def benchmark(path='/api/subjects/', runs=5, warm=False):
+    """
+    Measures time-to-first-response over ``runs`` fresh processes.
+
+    Returns a list of dicts with per-phase timings plus ``time_to_first_response``,
+    the wall time from spawning the interpreter until the first response completed.
+    """
+    code = f"from schoolapi.warmup import _child_run; _child_run({path!r}, {warm!r})"
+    results = []
+    for _ in range(runs):
+        spawned_at = time.time()
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result['timings']['time_to_first_response'] = result.pop('first_response_at') - spawned_at
+        results.append(result)
+    return results